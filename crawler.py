@@ -8,7 +8,9 @@ from PyQt5.QtCore import QThread, pyqtSignal, Qt
 import threading
 import concurrent.futures
 import csv
+from urllib.parse import urljoin, urlparse
 from tests import *
+from frontier import CrawlBudget, CrawlFrontier, LinkGraph, load_sitemap, resolve_url, save_link_graph, url_key, url_priority
 from pprint import pprint
 import sys
 import logging
@@ -67,6 +69,18 @@ sys.excepthook = handle_uncaught_exception
 # Number of concurrent threads for crawling
 MAX_THREADS = 1  
 
+# Crawl budgets (None means unlimited), read when a crawl starts
+MAX_PAGES = None  # Maximum number of pages to fetch
+MAX_DEPTH = None  # Maximum click depth from the start URL
+CRAWL_TIME_LIMIT = None  # Wall-clock budget in seconds
+SECTION_CAPS = {}  # Maximum pages per top-level section, e.g. {"blog": 50}
+
+# Marks CrawlerThread arguments left to the budget constants above
+USE_DEFAULT = object()
+
+# Load sitemap.xml priority and lastmod hints before crawling
+USE_SITEMAP = True
+
 def save_to_csv(data_list, filename="output.csv"):
     """
     Save a list of lists of dictionaries to a CSV file, preserving the order of columns.
@@ -102,32 +116,59 @@ class CrawlerThread(QThread):
     signal = pyqtSignal(list)  # Signal to emit the crawl results
     # Signal to emit the current page being visited, number of pages visited, and total pages found
     page_signal = pyqtSignal(str, int, int, list)
+    headers = {
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/58.0.3029.110 Safari/537.3'}
 
-    def __init__(self, url):
+    def __init__(self, url, max_pages=USE_DEFAULT, max_depth=USE_DEFAULT, time_limit=USE_DEFAULT, section_caps=USE_DEFAULT):
         super().__init__()
         self.url = url
+        self.root = url_key(url)  # Start URL as used for graph, frontier and sitemap keys
+        self.fetch_urls = {self.root: url}  # URL key -> URL as first discovered, used for fetching
         self.is_paused = threading.Event()
         self.is_paused.set()
         self.is_stopped = False
         self.visited = set()
-        self.to_visit = [url]
+        self.graph = LinkGraph()  # Link edges between crawled pages
+        self.graph.add_node(self.root)
+        self.frontier = CrawlFrontier()  # Prioritised URLs still to visit
+        self.frontier.push(self.root, url_priority(self.root, 0, 0))
+        self.sitemap = {}  # URL -> (priority, lastmod) from sitemap.xml
         self.results = []
         self.pages_visited = 0
         self.total_pages_found = 1
         self.lock = threading.Lock()  # Lock to ensure thread-safety when updating shared data
 
+        # Crawl budgets, falling back to the module constants at creation time
+        self.budget = CrawlBudget(
+            max_pages=MAX_PAGES if max_pages is USE_DEFAULT else max_pages,
+            max_depth=MAX_DEPTH if max_depth is USE_DEFAULT else max_depth,
+            time_limit=CRAWL_TIME_LIMIT if time_limit is USE_DEFAULT else time_limit,
+            section_caps=SECTION_CAPS if section_caps is USE_DEFAULT else section_caps,
+        )
+        self.budget.count_found(self.root)
+
     def run(self):
         all_page_data = []  # List to store page_data for all pages
 
+        self.budget.start()
+
+        if USE_SITEMAP:
+            self.sitemap = load_sitemap(self.root, headers=self.headers, deadline=self.budget.deadline,
+                                        should_stop=lambda: self.is_stopped)
+            with self.lock:
+                self.frontier.push(self.root, self.score(self.root))
+
         # Use ThreadPoolExecutor to concurrently fetch and parse URLs
         with concurrent.futures.ThreadPoolExecutor(max_workers=MAX_THREADS) as executor:
-            while self.to_visit and not self.is_stopped:
+            while not self.is_stopped:
                 self.is_paused.wait()  # Wait if the crawling is paused
-                futures = {executor.submit(self.fetch_and_parse, url): url for url in self.to_visit[:MAX_THREADS]}
-                self.to_visit = self.to_visit[MAX_THREADS:]
+                with self.lock:
+                    batch = self.budget.next_batch(self.frontier, self.visited, self.pages_visited, MAX_THREADS)
+                if not batch:
+                    break
+                futures = {executor.submit(self.fetch_and_parse, url): url for url in batch}
                 for future in concurrent.futures.as_completed(futures):
                     new_links, title_data, *page_data = future.result() # Updated to capture page_data
-                    self.to_visit.extend(new_links)
                     if title_data:
                         self.results.append(title_data)
 
@@ -138,19 +179,22 @@ class CrawlerThread(QThread):
         
         # Print out all the page_data after crawling is done
         save_to_csv(all_page_data)
+        save_link_graph(self.graph, self.root)
 
         self.signal.emit(self.results)  # Emit the crawl results when done
 
+    def score(self, url):
+        """Current frontier score of a URL known to the link graph."""
+        return url_priority(url, self.graph.depth(url), self.graph.inbound_count(url), self.sitemap.get(url))
 
-    def fetch_and_parse(self, url):
+    def fetch_and_parse(self, key):
         # Return if the URL has already been visited or if the crawl has been stopped
-        if url in self.visited or self.is_stopped:
+        if key in self.visited or self.is_stopped:
             return [], None
-        self.visited.add(url)
+        self.visited.add(key)
         self.pages_visited += 1
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/58.0.3029.110 Safari/537.3'}
-        response = requests.get(url, headers=headers)
+        response = requests.get(self.fetch_urls[key], headers=self.headers)
+        url = response.url  # Final URL after redirects, used for checks and reporting
 
         # Check if the content type is not HTML
         if 'text/html' not in response.headers.get('Content-Type', ''):
@@ -180,7 +224,7 @@ class CrawlerThread(QThread):
         page_data = {
             "H1": check_h1_tag(soup),
             "URL": url,
-            "Alias": "/" + url.replace(self.url, ""),
+            "Alias": urlparse(url).path or "/",
             "Title": check_title_tag(soup),
             "Meta Description": check_meta_description(soup),
             "Robots": check_meta_robots(soup),
@@ -193,21 +237,34 @@ class CrawlerThread(QThread):
             "GTM": check_gtm_installed(url),
         }
 
-        new_links = []
+        # Resolve relative links against the document URL, honouring <base href>
+        base_tag = soup.find('base', href=True)
+        base_url = urljoin(url, base_tag['href']) if base_tag else url
+
+        links = {}  # URL key -> URL as found on this page
+        site = urlparse(self.root).netloc
         for a_tag in soup.find_all('a', href=True):
-            href = a_tag['href']
-    
-            # Skip links that are just '#' or that contain '#'
-            if href == '#' or '#' in href:
+            href = resolve_url(base_url, a_tag['href'])
+
+            # Skip links to other sites and non-HTTP links such as mailto:
+            parsed = urlparse(href)
+            if parsed.scheme not in ('http', 'https') or parsed.netloc != site:
                 continue
-            
-            if href.startswith('/') or self.url in href:
-                if self.url not in href:
-                    href = self.url + href
-                with self.lock:  # Use the lock to ensure thread-safety
-                    if href not in self.visited and href not in self.to_visit:
-                        new_links.append(href)
-                        self.to_visit.append(href)  # Add to to_visit inside the lock
+            links.setdefault(url_key(href), href)
+
+        new_links = []
+        with self.lock:  # Use the lock to ensure thread-safety
+            for link_key, href in links.items():
+                self.fetch_urls.setdefault(link_key, href)
+
+            # Re-score every page whose inbound count or click depth changed
+            for changed in self.graph.add_links(key, links):
+                if changed in self.visited or not self.budget.allows_depth(self.graph.depth(changed)):
+                    continue
+                if self.frontier.push(changed, self.score(changed)):
+                    new_links.append(self.fetch_urls[changed])
+                    # Pages over their section cap will never be crawled
+                    if self.budget.count_found(changed):
                         self.total_pages_found += 1
         return new_links, title_data, page_data
     
@@ -0,0 +1,374 @@
+# frontier.py
+
+import csv
+import heapq
+import math
+import re
+import time
+import warnings
+from array import array
+from datetime import date
+from urllib.parse import urljoin, urldefrag, urlparse
+
+import requests
+from bs4 import BeautifulSoup
+
+# Weights used to order the crawl frontier (higher score is crawled first)
+DEPTH_WEIGHT = 1.0
+INBOUND_WEIGHT = 1.0
+SITEMAP_PRIORITY_WEIGHT = 2.0
+SITEMAP_RECENCY_WEIGHT = 1.0
+SITEMAP_RECENCY_DAYS = 30  # lastmod age at which the recency bonus is halved
+
+# Regex patterns matched against the URL and added to its score
+URL_PATTERN_WEIGHTS = {
+    r"/(tag|category|author)/": -2.0,
+    r"/page/\d+": -2.0,
+    r"/feed/?$": -3.0,
+    r"\?": -1.0,
+}
+
+# Maximum number of child sitemaps followed from a sitemap index
+MAX_CHILD_SITEMAPS = 20
+
+def resolve_url(base, href):
+    """Resolve href against the document URL base, dropping the fragment."""
+    url, _ = urldefrag(urljoin(base, href.strip()))
+    return url
+
+def url_key(url):
+    """
+    Normalized form of a URL used to de-duplicate pages in the link graph, frontier
+    and sitemap. Only a trailing slash on the path is dropped; the root path and the
+    query string are left alone.
+    """
+    parts = urlparse(url)
+    return parts._replace(path=parts.path.rstrip('/') or '/', fragment='').geturl()
+
+def url_section(url):
+    """Return the first path segment of the URL, used for per-section caps."""
+    path = urlparse(url).path.strip('/')
+    return path.split('/', 1)[0] if path else ""
+
+def url_priority(url, depth, inbound, sitemap_entry=None):
+    """
+    Score a URL for the crawl frontier. Shallow, well-linked pages that the sitemap
+    marks as important or recently modified score highest.
+
+    Args:
+        url (str): The URL to score.
+        depth (int): Click depth from the start URL.
+        inbound (int): Number of distinct pages linking to the URL.
+        sitemap_entry (tuple): Optional (priority, lastmod) pair from the sitemap.
+    """
+    score = -DEPTH_WEIGHT * depth + INBOUND_WEIGHT * math.log1p(inbound)
+
+    if sitemap_entry:
+        priority, lastmod = sitemap_entry
+        if priority is not None:
+            score += SITEMAP_PRIORITY_WEIGHT * priority
+        if lastmod is not None:
+            age_days = max((date.today() - lastmod).days, 0)
+            score += SITEMAP_RECENCY_WEIGHT * SITEMAP_RECENCY_DAYS / (SITEMAP_RECENCY_DAYS + age_days)
+
+    for pattern, weight in URL_PATTERN_WEIGHTS.items():
+        if re.search(pattern, url):
+            score += weight
+
+    return score
+
+def parse_sitemap(content):
+    """
+    Parse a sitemap or sitemap index.
+
+    Returns:
+        tuple: A dictionary mapping each normalized URL to a (priority, lastmod) pair,
+        and a list of child sitemap URLs.
+    """
+    # html.parser handles sitemap tags fine; lxml is not a dependency
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        soup = BeautifulSoup(content, 'html.parser')
+    children = [loc.text.strip() for loc in soup.select('sitemap > loc')]
+
+    entries = {}
+    for url_tag in soup.find_all('url'):
+        loc = url_tag.find('loc')
+        if not loc:
+            continue
+        priority_tag = url_tag.find('priority')
+        lastmod_tag = url_tag.find('lastmod')
+        try:
+            priority = float(priority_tag.text) if priority_tag else None
+        except ValueError:
+            priority = None
+        try:
+            lastmod = date.fromisoformat(lastmod_tag.text.strip()[:10]) if lastmod_tag else None
+        except ValueError:
+            lastmod = None
+        entries[url_key(loc.text.strip())] = (priority, lastmod)
+
+    return entries, children
+
+def load_sitemap(url, headers=None, deadline=None, should_stop=None, max_children=MAX_CHILD_SITEMAPS):
+    """
+    Fetch sitemap.xml for the site and return a dictionary mapping each URL to a
+    (priority, lastmod) pair. Sitemap indexes are followed one level deep.
+
+    Args:
+        url (str): Any URL on the site.
+        headers (dict): Optional request headers.
+        deadline (float): Optional time.monotonic() value after which no more sitemaps are fetched.
+        should_stop (callable): Optional callable returning True when loading should be abandoned.
+        max_children (int): Maximum number of child sitemaps to follow.
+    """
+    def out_of_time():
+        return ((should_stop is not None and should_stop())
+                or (deadline is not None and time.monotonic() >= deadline))
+
+    def fetch(sitemap_url):
+        timeout = 10
+        if deadline is not None:
+            timeout = min(timeout, max(deadline - time.monotonic(), 0.1))
+        try:
+            response = requests.get(sitemap_url, headers=headers, timeout=timeout)
+        except requests.RequestException:
+            return None
+        return response.content if response.status_code == 200 else None
+
+    if out_of_time():
+        return {}
+    content = fetch(urljoin(url, "/sitemap.xml"))
+    if content is None:
+        return {}
+
+    entries, children = parse_sitemap(content)
+    for child in children[:max_children]:
+        if out_of_time():
+            break
+        content = fetch(child)
+        if content is not None:
+            entries.update(parse_sitemap(content)[0])
+
+    return entries
+
+class LinkGraph:
+    """
+    Compact directed graph of the links found while crawling. URLs are interned to
+    integer ids and edges are stored as arrays of ids, so inbound counts and click
+    depths can be looked up without walking the whole graph.
+    """
+
+    def __init__(self):
+        self.ids = {}  # URL -> node id
+        self.urls = []  # node id -> URL
+        self.out_links = []  # node id -> array of target node ids
+        self.inbound = array('I')  # node id -> number of distinct linking pages
+        self.depths = array('I')  # node id -> shortest known click depth
+
+    def __len__(self):
+        return len(self.urls)
+
+    def __contains__(self, url):
+        return url in self.ids
+
+    def add_node(self, url, depth=0):
+        """Add a URL to the graph if needed and return its node id."""
+        node = self.ids.get(url)
+        if node is None:
+            node = len(self.urls)
+            self.ids[url] = node
+            self.urls.append(url)
+            self.out_links.append(array('I'))
+            self.inbound.append(0)
+            self.depths.append(depth)
+        return node
+
+    def add_edge(self, source, target):
+        """Record a single link from source to target. See add_links."""
+        return self.add_links(source, [target])
+
+    def add_links(self, source, targets):
+        """
+        Record the links from source to each of targets, ignoring self-links and
+        links that are already known.
+
+        Returns:
+            list: URLs whose inbound count or click depth changed. A shorter path to
+            a target is propagated breadth-first to everything it links to.
+        """
+        source_id = self.ids[source]
+        out_links = self.out_links[source_id]
+        known = set(out_links)
+        known.add(source_id)
+
+        changed = []
+        relax = []
+        for target in targets:
+            target_id = self.add_node(target, self.depths[source_id] + 1)
+            if target_id in known:
+                continue
+            known.add(target_id)
+            out_links.append(target_id)
+            self.inbound[target_id] += 1
+            changed.append(target_id)
+            if self.depths[source_id] + 1 < self.depths[target_id]:
+                self.depths[target_id] = self.depths[source_id] + 1
+                relax.append(target_id)
+
+        for node in relax:
+            for child in self.out_links[node]:
+                if self.depths[node] + 1 < self.depths[child]:
+                    self.depths[child] = self.depths[node] + 1
+                    changed.append(child)
+                    relax.append(child)
+        return [self.urls[node] for node in dict.fromkeys(changed)]
+
+    def inbound_count(self, url):
+        return self.inbound[self.ids[url]]
+
+    def depth(self, url):
+        return self.depths[self.ids[url]]
+
+    def click_depths(self, root):
+        """Return exact click depths of every reachable node from root (breadth-first)."""
+        depths = {self.ids[root]: 0}
+        queue = [self.ids[root]]
+        for node in queue:
+            for target in self.out_links[node]:
+                if target not in depths:
+                    depths[target] = depths[node] + 1
+                    queue.append(target)
+        return {self.urls[node]: depth for node, depth in depths.items()}
+
+def save_link_graph(graph, root, filename="link_graph.csv"):
+    """
+    Save the link graph to a CSV file with one row per URL.
+
+    Args:
+        graph (LinkGraph): The link graph recorded during the crawl.
+        root (str): The start URL, used to compute click depths.
+        filename (str): Name of the CSV file to save the graph to. Defaults to "link_graph.csv".
+    """
+    if not len(graph):
+        return
+
+    depths = graph.click_depths(root) if root in graph else {}
+
+    with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
+        writer = csv.writer(csvfile)
+        writer.writerow(["URL", "Depth", "Inbound Links", "Outbound Links", "Links To"])
+        for node, url in enumerate(graph.urls):
+            targets = [graph.urls[target] for target in graph.out_links[node]]
+            writer.writerow([url, depths.get(url, ""), graph.inbound[node], len(targets), "\n".join(targets)])
+
+class CrawlFrontier:
+    """
+    Priority queue of URLs waiting to be crawled. A URL is re-queued whenever its
+    score changes; outdated heap entries are skipped when popped and dropped when
+    they outnumber the queued URLs.
+    """
+
+    def __init__(self):
+        self.heap = []
+        self.scores = {}  # URL -> (score, counter) of its current heap entry
+        self.counter = 0  # Tie-breaker keeping discovery order for equal scores
+        self.seen = set()  # Every URL ever queued
+
+    def __len__(self):
+        return len(self.scores)
+
+    def __contains__(self, url):
+        return url in self.scores
+
+    def push(self, url, score):
+        """Queue or re-score a URL. Returns True the first time a URL is queued."""
+        current = self.scores.get(url)
+        if current is not None and current[0] == score:
+            return False
+        self.scores[url] = (score, self.counter)
+        heapq.heappush(self.heap, (-score, self.counter, url))
+        self.counter += 1
+
+        if len(self.heap) > 2 * len(self.scores) + 64:
+            self.heap = [(-score, counter, url) for url, (score, counter) in self.scores.items()]
+            heapq.heapify(self.heap)
+
+        is_new = url not in self.seen
+        self.seen.add(url)
+        return is_new
+
+    def pop(self):
+        """Return the highest scoring URL, or None if the frontier is empty."""
+        while self.heap:
+            neg_score, counter, url = heapq.heappop(self.heap)
+            if self.scores.get(url) == (-neg_score, counter):
+                del self.scores[url]
+                return url
+        return None
+
+class CrawlBudget:
+    """
+    Limits on how much of a site is crawled. Every limit is optional; None means unlimited.
+
+    Args:
+        max_pages (int): Maximum number of pages to fetch.
+        max_depth (int): Maximum click depth from the start URL.
+        time_limit (float): Wall-clock budget in seconds, counted from start().
+        section_caps (dict): Maximum pages per top-level section, e.g. {"blog": 50}.
+    """
+
+    def __init__(self, max_pages=None, max_depth=None, time_limit=None, section_caps=None):
+        self.max_pages = max_pages
+        self.max_depth = max_depth
+        self.time_limit = time_limit
+        self.section_caps = section_caps or {}
+        self.section_counts = {}  # Section -> number of pages scheduled
+        self.section_found = {}  # Section -> number of pages counted as found
+        self.deadline = None
+
+    def start(self):
+        """Start the wall-clock budget."""
+        if self.time_limit is not None:
+            self.deadline = time.monotonic() + self.time_limit
+
+    def out_of_time(self):
+        return self.deadline is not None and time.monotonic() >= self.deadline
+
+    def allows_depth(self, depth):
+        return self.max_depth is None or depth <= self.max_depth
+
+    def count_found(self, url):
+        """
+        Record a newly queued URL for the "total pages" count. Returns False once its
+        section already has as many queued pages as its cap allows.
+        """
+        section = url_section(url)
+        cap = self.section_caps.get(section)
+        found = self.section_found.get(section, 0)
+        if cap is not None and found >= cap:
+            return False
+        self.section_found[section] = found + 1
+        return True
+
+    def next_batch(self, frontier, visited, pages_visited, size):
+        """
+        Pop up to size of the highest priority URLs that fit within the budgets.
+        URLs over their section cap are dropped from the frontier.
+        """
+        batch = []
+        while len(batch) < size and not self.out_of_time():
+            if self.max_pages is not None and pages_visited + len(batch) >= self.max_pages:
+                break
+            url = frontier.pop()
+            if url is None:
+                break
+            if url in visited:
+                continue
+            section = url_section(url)
+            cap = self.section_caps.get(section)
+            if cap is not None and self.section_counts.get(section, 0) >= cap:
+                continue
+            self.section_counts[section] = self.section_counts.get(section, 0) + 1
+            batch.append(url)
+        return batch
@@ -0,0 +1,227 @@
+# test_frontier.py
+
+import time
+import unittest
+from datetime import date
+from unittest import mock
+
+import frontier
+from frontier import (CrawlBudget, CrawlFrontier, LinkGraph, load_sitemap, parse_sitemap, resolve_url,
+                      url_key, url_priority, url_section)
+
+SITEMAP_XML = b"""<?xml version="1.0" encoding="UTF-8"?>
+<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+  <url>
+    <loc>http://example.org/about/</loc>
+    <lastmod>2023-10-10T12:00:00+00:00</lastmod>
+    <priority>0.8</priority>
+  </url>
+  <url>
+    <loc>http://example.org/blog</loc>
+    <priority>not-a-number</priority>
+  </url>
+</urlset>
+"""
+
+SITEMAP_INDEX_XML = b"""<?xml version="1.0" encoding="UTF-8"?>
+<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+  <sitemap><loc>http://example.org/sitemap-1.xml</loc></sitemap>
+  <sitemap><loc>http://example.org/sitemap-2.xml</loc></sitemap>
+  <sitemap><loc>http://example.org/sitemap-3.xml</loc></sitemap>
+</sitemapindex>
+"""
+
+def fake_response(content, status_code=200):
+    return mock.Mock(content=content, status_code=status_code)
+
+class UrlTests(unittest.TestCase):
+    def test_root_relative_link(self):
+        self.assertEqual(resolve_url("http://example.org/", "/about"), "http://example.org/about")
+
+    def test_relative_link_from_directory_page(self):
+        base = "https://ex.org/blog/"
+        self.assertEqual(resolve_url(base, "post-1"), "https://ex.org/blog/post-1")
+        self.assertEqual(resolve_url(base, "../x"), "https://ex.org/x")
+        self.assertEqual(resolve_url(base, "post-2/#comments"), "https://ex.org/blog/post-2/")
+
+    def test_url_key_drops_trailing_slash_from_path_only(self):
+        self.assertEqual(url_key("http://example.org/about/"), "http://example.org/about")
+        self.assertEqual(url_key("http://example.org/about#team"), "http://example.org/about")
+        self.assertEqual(url_key("http://example.org/go?next=/"), "http://example.org/go?next=/")
+
+    def test_url_key_keeps_root_path(self):
+        self.assertEqual(url_key("http://example.org/"), "http://example.org/")
+        self.assertEqual(url_key("http://example.org"), "http://example.org/")
+
+    def test_url_section(self):
+        self.assertEqual(url_section("http://example.org/blog/post"), "blog")
+        self.assertEqual(url_section("http://example.org"), "")
+
+class LinkGraphTests(unittest.TestCase):
+    def test_inbound_counts_ignore_duplicates_and_self_links(self):
+        graph = LinkGraph()
+        graph.add_node("r")
+        self.assertEqual(graph.add_edge("r", "a"), ["a"])
+        self.assertEqual(graph.add_edge("r", "a"), [])
+        self.assertEqual(graph.add_edge("a", "a"), [])
+        graph.add_edge("a", "b")
+        graph.add_edge("r", "b")
+        self.assertEqual(graph.inbound_count("a"), 1)
+        self.assertEqual(graph.inbound_count("b"), 2)
+
+    def test_shorter_path_propagates_to_descendants(self):
+        graph = LinkGraph()
+        graph.add_node("r")
+        for source, target in [("r", "x"), ("x", "y"), ("y", "p"), ("p", "c"), ("c", "d")]:
+            graph.add_edge(source, target)
+        self.assertEqual(graph.depth("d"), 5)
+
+        changed = graph.add_edge("r", "p")
+        self.assertEqual(changed, ["p", "c", "d"])
+        self.assertEqual([graph.depth(url) for url in changed], [1, 2, 3])
+        self.assertEqual(graph.click_depths("r")["d"], 3)
+
+    def test_add_links_skips_repeated_targets(self):
+        graph = LinkGraph()
+        graph.add_node("r")
+        self.assertEqual(graph.add_links("r", ["a", "b", "a", "r"]), ["a", "b"])
+        self.assertEqual(graph.add_links("r", ["b", "c"]), ["c"])
+        self.assertEqual(list(graph.out_links[graph.ids["r"]]), [graph.ids[url] for url in "abc"])
+        self.assertEqual(graph.inbound_count("a"), 1)
+
+    def test_longer_path_changes_only_target(self):
+        graph = LinkGraph()
+        graph.add_node("r")
+        graph.add_edge("r", "a")
+        graph.add_edge("a", "b")
+        graph.add_edge("b", "c")
+        self.assertEqual(graph.add_edge("c", "a"), ["a"])
+        self.assertEqual(graph.depth("a"), 1)
+
+class CrawlFrontierTests(unittest.TestCase):
+    def test_pops_highest_score_and_skips_stale_entries(self):
+        queue = CrawlFrontier()
+        queue.push("a", 1.0)
+        queue.push("b", 2.0)
+        queue.push("a", 3.0)
+        self.assertEqual(queue.pop(), "a")
+        self.assertEqual(queue.pop(), "b")
+        self.assertIsNone(queue.pop())
+
+    def test_equal_scores_keep_discovery_order(self):
+        queue = CrawlFrontier()
+        for url in ["a", "b", "c"]:
+            queue.push(url, 0.0)
+        self.assertEqual([queue.pop() for _ in range(3)], ["a", "b", "c"])
+
+    def test_push_reports_first_queueing_only(self):
+        queue = CrawlFrontier()
+        self.assertTrue(queue.push("a", 1.0))
+        self.assertFalse(queue.push("a", 2.0))
+        queue.pop()
+        self.assertFalse(queue.push("a", 1.0))
+
+    def test_stale_entries_are_compacted(self):
+        queue = CrawlFrontier()
+        queue.push("b", 0.0)
+        for score in range(1000):
+            queue.push("a", float(score))
+        self.assertLessEqual(len(queue.heap), 2 * len(queue) + 65)
+        self.assertEqual([queue.pop(), queue.pop(), queue.pop()], ["a", "b", None])
+
+class UrlPriorityTests(unittest.TestCase):
+    def test_depth_inbound_and_patterns(self):
+        self.assertGreater(url_priority("http://e/a", 1, 0), url_priority("http://e/b", 2, 0))
+        self.assertGreater(url_priority("http://e/a", 1, 5), url_priority("http://e/b", 1, 0))
+        self.assertLess(url_priority("http://e/tag/x", 1, 0), url_priority("http://e/x", 1, 0))
+
+    def test_sitemap_priority_and_recency(self):
+        base = url_priority("http://e/a", 1, 0)
+        self.assertGreater(url_priority("http://e/a", 1, 0, (0.5, None)), base)
+        recent = url_priority("http://e/a", 1, 0, (None, date.today()))
+        stale = url_priority("http://e/a", 1, 0, (None, date(2000, 1, 1)))
+        self.assertGreater(recent, stale)
+        self.assertGreater(stale, base)
+
+class CrawlBudgetTests(unittest.TestCase):
+    def make_frontier(self, urls):
+        queue = CrawlFrontier()
+        for score, url in enumerate(reversed(urls)):
+            queue.push(url, float(score))
+        return queue
+
+    def test_max_pages(self):
+        queue = self.make_frontier(["a", "b", "c"])
+        budget = CrawlBudget(max_pages=2)
+        self.assertEqual(budget.next_batch(queue, set(), 0, 5), ["a", "b"])
+        self.assertEqual(budget.next_batch(queue, set(), 2, 5), [])
+
+    def test_skips_visited_urls(self):
+        queue = self.make_frontier(["a", "b"])
+        self.assertEqual(CrawlBudget().next_batch(queue, {"a"}, 0, 5), ["b"])
+
+    def test_section_caps(self):
+        urls = ["http://e/blog/1", "http://e/blog/2", "http://e/about", "http://e/blog/3"]
+        queue = self.make_frontier(urls)
+        budget = CrawlBudget(section_caps={"blog": 2})
+        self.assertEqual(budget.next_batch(queue, set(), 0, 10), urls[:3])
+
+    def test_found_count_respects_section_caps(self):
+        budget = CrawlBudget(section_caps={"blog": 1})
+        self.assertTrue(budget.count_found("http://e/blog/1"))
+        self.assertFalse(budget.count_found("http://e/blog/2"))
+        self.assertTrue(budget.count_found("http://e/about"))
+
+    def test_deadline(self):
+        queue = self.make_frontier(["a"])
+        budget = CrawlBudget(time_limit=0)
+        budget.start()
+        self.assertEqual(budget.next_batch(queue, set(), 0, 5), [])
+
+    def test_max_depth(self):
+        budget = CrawlBudget(max_depth=2)
+        self.assertTrue(budget.allows_depth(2))
+        self.assertFalse(budget.allows_depth(3))
+        self.assertTrue(CrawlBudget().allows_depth(100))
+
+class SitemapTests(unittest.TestCase):
+    def test_parse_sitemap(self):
+        entries, children = parse_sitemap(SITEMAP_XML)
+        self.assertEqual(children, [])
+        self.assertEqual(entries, {
+            "http://example.org/about": (0.8, date(2023, 10, 10)),
+            "http://example.org/blog": (None, None),
+        })
+
+    def test_parse_sitemap_index(self):
+        entries, children = parse_sitemap(SITEMAP_INDEX_XML)
+        self.assertEqual(entries, {})
+        self.assertEqual(len(children), 3)
+
+    def test_load_sitemap_follows_limited_children(self):
+        responses = [fake_response(SITEMAP_INDEX_XML), fake_response(SITEMAP_XML), fake_response(b"", 404)]
+        with mock.patch.object(frontier.requests, "get", side_effect=responses) as get:
+            entries = load_sitemap("http://example.org/", max_children=2)
+        self.assertEqual(get.call_count, 3)
+        self.assertEqual(get.call_args_list[0].args[0], "http://example.org/sitemap.xml")
+        self.assertIn("http://example.org/about", entries)
+
+    def test_load_sitemap_stops(self):
+        # Stop is requested while the sitemap index is being fetched
+        stopped = []
+
+        def fetch(*args, **kwargs):
+            stopped.append(True)
+            return fake_response(SITEMAP_INDEX_XML)
+
+        with mock.patch.object(frontier.requests, "get", side_effect=fetch) as get:
+            load_sitemap("http://example.org/", should_stop=lambda: bool(stopped))
+        self.assertEqual(get.call_count, 1)
+
+    def test_load_sitemap_respects_deadline(self):
+        with mock.patch.object(frontier.requests, "get") as get:
+            self.assertEqual(load_sitemap("http://example.org/", deadline=time.monotonic() - 1), {})
+        get.assert_not_called()
+
+if __name__ == '__main__':
+    unittest.main()